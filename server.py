@@ -8,22 +8,89 @@ import signal
 import json
 import secrets
 import socket
-from aiohttp import web
+import time
+import base64
+import bisect
+import gzip
+import hashlib
+import hmac
+import html
+import tempfile
+import warnings
+from collections import Counter, OrderedDict, deque
+from functools import lru_cache
+from aiohttp import web, WSCloseCode
 
 import subprocess
 import shutil
 
+# orjson is much faster than the stdlib json module when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional in-process verifiers for htpasswd hashes; formats without one
+# fall back to `htpasswd -vb`
+try:
+    import bcrypt
+except ImportError:
+    bcrypt = None
+try:
+    from passlib.hash import apr_md5_crypt
+except ImportError:
+    apr_md5_crypt = None
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        import crypt
+except ImportError:
+    crypt = None
+
 # Server-side state storage (persists across browser sessions)
-STATE_FILE = os.path.expanduser('~/.rdock_state.json')
+HOME_DIR = os.path.expanduser('~')
+STATE_FILE = os.path.join(HOME_DIR, '.rdock_state.json')
+STATE_FLUSH_DELAY = 1.0  # Seconds to coalesce state updates before writing
 HTPASSWD_FILE = '/etc/nginx/.htpasswd'
-SESSIONS = {}  # In-memory session store
+_HTPASSWD_CACHE = {'mtime': None, 'users': {}, 'nonempty': False, 'decoy': None}
+TERMINALS = {}  # Open terminal WebSocket -> WebTerminal
+SESSIONS = OrderedDict()  # In-memory session store, least recently used first
+SESSION_TTL = 86400 * 30  # Matches the session cookie max_age
+MAX_SESSIONS = 10_000
+
+# Opcodes for binary terminal messages (first byte of each frame)
+MSG_INPUT = 0x01  # Remaining bytes are written to the PTY
+MSG_RESIZE = 0x02  # Followed by rows, cols as big-endian uint16
+MSG_PAUSE = 0x03  # Client is behind on rendering; stop reading the PTY
+MSG_RESUME = 0x04  # Client caught up; resume reading
+
+PTY_READ_SIZE = 65536  # Bytes per PTY read; big enough to drain bursts in one call
+
+# Max PTY output buffered per socket before reading pauses (terminals) or
+# the oldest output is dropped (gpustat)
+OUTPUT_BUFFER_LIMIT = 1 << 20
 
 # Base path for when rdock is served under a sub-path (e.g., /rdock)
 # This affects redirects and asset paths
 BASE_PATH = os.environ.get('RDOCK_BASE_PATH', '').rstrip('/')
 
+if orjson:
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+else:
+    def json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    json_loads = json.loads
+
+
+def json_response(data, status=200):
+    """Like web.json_response, but encoded with orjson when available."""
+    return web.Response(body=json_dumps(data), status=status, content_type='application/json')
+
+
+@lru_cache(maxsize=None)
 def get_server_info():
-    """Get server hostname and other info for display."""
+    """Get server hostname and other info for display (cached; getfqdn may hit DNS)."""
     hostname = socket.gethostname()
     try:
         # Try to get FQDN
@@ -37,6 +104,62 @@ def get_server_info():
         'user': os.environ.get('USER', 'unknown'),
     }
 
+def load_htpasswd_users():
+    """Return {username: hash} from the htpasswd file, re-reading it only when it changes."""
+    mtime = os.stat(HTPASSWD_FILE).st_mtime_ns
+    if mtime != _HTPASSWD_CACHE['mtime']:
+        users = {}
+        nonempty = False
+        with open(HTPASSWD_FILE, 'r') as f:
+            for line in f:
+                line = line.strip()
+                nonempty = nonempty or bool(line)
+                user, sep, hashed = line.partition(':')
+                if sep:
+                    users[user] = hashed
+        _HTPASSWD_CACHE['users'] = users
+        _HTPASSWD_CACHE['nonempty'] = nonempty
+        _HTPASSWD_CACHE['decoy'] = pick_decoy_hash(users.values())
+        _HTPASSWD_CACHE['mtime'] = mtime
+    return _HTPASSWD_CACHE['users']
+
+def hash_cost_class(hashed):
+    """Group htpasswd hashes that take the same time to check: format, plus cost for bcrypt."""
+    if hashed.startswith('$2'):
+        return hashed[:7]  # e.g. '$2y$05$'
+    if hashed.startswith('$'):
+        return hashed.split('$', 2)[1]
+    return '{SHA}' if hashed.startswith('{SHA}') else 'crypt'
+
+def pick_decoy_hash(hashes):
+    """Return a hash of the file's most common format and cost, to check unknown users against."""
+    counts = Counter()
+    examples = {}
+    for hashed in hashes:
+        key = hash_cost_class(hashed)
+        counts[key] += 1
+        examples.setdefault(key, hashed)
+    return examples[counts.most_common(1)[0][0]] if counts else None
+
+def check_password_hash(password, hashed):
+    """Check a password against an htpasswd hash in-process.
+    
+    Returns None if no verifier for the hash format is installed.
+    """
+    if hashed.startswith('$2'):
+        if bcrypt:
+            return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    elif hashed.startswith('$apr1$'):
+        if apr_md5_crypt:
+            return apr_md5_crypt.verify(password, hashed)
+    elif hashed.startswith('{SHA}'):
+        digest = base64.b64encode(hashlib.sha1(password.encode('utf-8')).digest()).decode('ascii')
+        return hmac.compare_digest(digest, hashed[5:])
+    elif hashed.startswith(('$5$', '$6$')):
+        if crypt:
+            return hmac.compare_digest(crypt.crypt(password, hashed) or '', hashed)
+    return None
+
 def verify_htpasswd(username, password):
     """Verify username/password against nginx htpasswd file."""
     if not os.path.exists(HTPASSWD_FILE):
@@ -44,37 +167,59 @@ def verify_htpasswd(username, password):
         return False
     
     try:
-        # Use htpasswd -vb to verify password (works with all hash formats)
-        result = subprocess.run(
-            ['htpasswd', '-vb', HTPASSWD_FILE, username, password],
-            capture_output=True
-        )
-        return result.returncode == 0
+        hashed = load_htpasswd_users().get(username)
+        known = hashed is not None
+        if not known:
+            # Unknown users go through the same checks as a wrong password
+            # for the file's typical entry, so timing doesn't reveal them
+            hashed = _HTPASSWD_CACHE['decoy']
+            if hashed is None:
+                return False
+        result = check_password_hash(password, hashed)
+        if result is None:
+            # Use htpasswd -vb for hash formats we can't check in-process
+            result = subprocess.run(
+                ['htpasswd', '-vb', HTPASSWD_FILE, username, password],
+                capture_output=True
+            ).returncode == 0
+        return known and result
     except Exception as e:
         print(f"Error verifying password: {e}")
     return False
 
 def htpasswd_exists():
-    """Check if htpasswd file exists and has users."""
-    if not os.path.exists(HTPASSWD_FILE):
-        return False
+    """Check if htpasswd file exists and has users (a stat() unless it changed)."""
     try:
-        with open(HTPASSWD_FILE, 'r') as f:
-            return any(line.strip() for line in f)
-    except:
+        load_htpasswd_users()
+    except (OSError, ValueError):
         return False
+    return _HTPASSWD_CACHE['nonempty']
 
 def verify_session(request):
     """Check if request has valid session."""
     session_id = request.cookies.get('session_id')
-    if session_id and session_id in SESSIONS:
-        return True
-    return False
+    session = SESSIONS.get(session_id) if session_id else None
+    if session is None:
+        return False
+    now = time.monotonic()
+    if session['exp'] <= now:
+        del SESSIONS[session_id]
+        return False
+    # Sliding expiry keeps SESSIONS ordered by expiry time
+    session['exp'] = now + SESSION_TTL
+    SESSIONS.move_to_end(session_id)
+    return True
 
 def create_session(username):
-    """Create a new session."""
+    """Create a new session, evicting expired and least recently used ones."""
+    now = time.monotonic()
+    while SESSIONS:
+        oldest = next(iter(SESSIONS.values()))
+        if oldest['exp'] > now and len(SESSIONS) < MAX_SESSIONS:
+            break
+        SESSIONS.popitem(last=False)
     session_id = secrets.token_urlsafe(32)
-    SESSIONS[session_id] = {'username': username}
+    SESSIONS[session_id] = {'username': username, 'exp': now + SESSION_TTL}
     return session_id
 
 
@@ -82,22 +227,113 @@ def load_server_state():
     """Load persisted state from file."""
     try:
         if os.path.exists(STATE_FILE):
-            with open(STATE_FILE, 'r') as f:
-                return json.load(f)
+            with open(STATE_FILE, 'rb') as f:
+                return json_loads(f.read())
     except Exception as e:
         print(f"Error loading state: {e}")
     return {'tabs': [], 'activeTabId': None, 'tabCounter': 0, 'terminalCounter': 0, 'vscodeCounter': 0, 'recentWorkspaces': []}
 
 
+def write_state_file(data):
+    """Atomically replace the state file with already-serialized data."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(STATE_FILE), prefix='.rdock_state.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, STATE_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
 def save_server_state(state):
     """Save state to file."""
     try:
-        with open(STATE_FILE, 'w') as f:
-            json.dump(state, f)
+        write_state_file(json_dumps(state))
     except Exception as e:
         print(f"Error saving state: {e}")
 
 
+# State is served from memory; disk writes are debounced by flush_state_later
+_STATE = load_server_state()
+_STATE_FLUSH = {'dirty': False, 'task': None, 'write': None}
+
+
+def mark_state_dirty():
+    """Schedule a state write unless one is already pending."""
+    _STATE_FLUSH['dirty'] = True
+    task = _STATE_FLUSH['task']
+    if task is None or task.done():
+        _STATE_FLUSH['task'] = asyncio.create_task(flush_state_later())
+
+
+async def flush_state_later():
+    """Write state at most once per STATE_FLUSH_DELAY while it keeps changing."""
+    loop = asyncio.get_running_loop()
+    while _STATE_FLUSH['dirty']:
+        await asyncio.sleep(STATE_FLUSH_DELAY)
+        _STATE_FLUSH['dirty'] = False
+        # Serialize on the loop for a consistent snapshot, write off-loop
+        data = json_dumps(_STATE)
+        # Shielded so cancelling this task can't orphan a write still running
+        # in the executor; shutdown waits for it instead
+        write = _STATE_FLUSH['write'] = loop.run_in_executor(None, write_state_file, data)
+        try:
+            await asyncio.shield(write)
+        except Exception as e:
+            print(f"Error saving state: {e}")
+        finally:
+            if write.done():
+                _STATE_FLUSH['write'] = None
+
+
+async def flush_state_on_cleanup(app):
+    """Persist any pending state before the server exits."""
+    task = _STATE_FLUSH['task']
+    if task is not None:
+        task.cancel()
+    # Let an in-flight write land first so it can't replace the newer
+    # snapshot written below
+    write = _STATE_FLUSH['write']
+    if write is not None:
+        _STATE_FLUSH['write'] = None
+        try:
+            await write
+        except Exception as e:
+            print(f"Error saving state: {e}")
+    if _STATE_FLUSH['dirty']:
+        _STATE_FLUSH['dirty'] = False
+        save_server_state(_STATE)
+
+
+def set_tcp_option(sock, option, value):
+    """Best-effort setsockopt on a TCP socket; returns False if unsupported."""
+    if sock is None or option is None:
+        return False
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, option, value)
+        return True
+    except OSError:
+        return False
+
+
+def install_event_loop_policy():
+    """Use a faster event loop implementation when one is installed."""
+    if os.environ.get('RDOCK_URING') == '1':
+        try:
+            import uringcore
+            asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+            return 'uringcore'
+        except ImportError:
+            print("Warning: RDOCK_URING=1 but uringcore is not installed")
+    try:
+        import uvloop
+        uvloop.install()
+        return 'uvloop'
+    except ImportError:
+        return 'asyncio'
+
+
 def check_tmux_available():
     """Check if tmux is available on the system."""
     return shutil.which('tmux') is not None
@@ -110,40 +346,33 @@ class WebTerminal:
         self.master_fd = None
         self.pid = None
         self.session_name = None
+        # Reused for every read; only the bytes actually read are copied out
+        self._readbuf = bytearray(PTY_READ_SIZE)
+        self._readview = memoryview(self._readbuf)
     
     def spawn(self, shell='/bin/bash', session_name=None):
         """Spawn a new PTY with shell, optionally using tmux for persistence."""
         self.session_name = session_name
+        use_tmux = bool(session_name) and check_tmux_available()
         self.pid, self.master_fd = pty.fork()
         
         if self.pid == 0:
             # Child process
-            home_dir = os.path.expanduser('~')
-            os.chdir(home_dir)
+            os.chdir(HOME_DIR)
             env = os.environ.copy()
             env['TERM'] = 'xterm-256color'
-            env['HOME'] = home_dir
+            env['HOME'] = HOME_DIR
             
-            if session_name and check_tmux_available():
-                # Use tmux for persistent sessions
-                # Check if session exists
-                result = subprocess.run(
-                    ['tmux', 'has-session', '-t', session_name],
-                    capture_output=True
-                )
-                if result.returncode == 0:
-                    # Session exists, attach to it
-                    os.execvpe('tmux', ['tmux', 'attach-session', '-t', session_name], env)
-                else:
-                    # Create new session
-                    os.execvpe('tmux', ['tmux', 'new-session', '-s', session_name], env)
+            if use_tmux:
+                # Use tmux for persistent sessions; -A attaches if the
+                # session already exists, so no separate has-session check
+                os.execvpe('tmux', ['tmux', 'new-session', '-A', '-s', session_name], env)
             else:
                 # Plain shell without tmux
                 os.execvpe(shell, [shell], env)
         else:
             # Parent - set non-blocking
-            flags = fcntl.fcntl(self.master_fd, fcntl.F_GETFL)
-            fcntl.fcntl(self.master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+            os.set_blocking(self.master_fd, False)
     
     def spawn_command(self, command, args=[]):
         """Spawn a specific command in a PTY (for things like gpustat)."""
@@ -164,8 +393,7 @@ class WebTerminal:
                 os._exit(1)
         else:
             # Parent - set non-blocking
-            flags = fcntl.fcntl(self.master_fd, fcntl.F_GETFL)
-            fcntl.fcntl(self.master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+            os.set_blocking(self.master_fd, False)
     
     def resize(self, rows, cols):
         """Resize the PTY."""
@@ -174,18 +402,29 @@ class WebTerminal:
             fcntl.ioctl(self.master_fd, termios.TIOCSWINSZ, winsize)
     
     def write(self, data):
-        """Write data to PTY."""
+        """Write data (str or bytes-like) to PTY."""
         if self.master_fd:
-            os.write(self.master_fd, data.encode())
+            if isinstance(data, str):
+                data = data.encode('utf-8')
+            os.write(self.master_fd, data)
     
     def read(self):
-        """Read available data from PTY."""
-        if self.master_fd:
+        """Drain available data from PTY. Returns None once the PTY has closed."""
+        chunks = []
+        while True:
             try:
-                return os.read(self.master_fd, 4096).decode('utf-8', errors='replace')
-            except (OSError, BlockingIOError):
-                return None
-        return None
+                n = os.readv(self.master_fd, [self._readbuf])
+            except BlockingIOError:
+                break
+            except OSError:
+                # EIO: the child side of the PTY has closed
+                n = 0
+            if not n:
+                if not chunks:
+                    return None
+                break
+            chunks.append(self._readview[:n].tobytes())
+        return b''.join(chunks)
     
     def close(self):
         """Clean up PTY. For tmux sessions, just detach (session persists)."""
@@ -207,9 +446,19 @@ class WebTerminal:
 
 async def terminal_handler(request):
     """WebSocket handler for terminal connections."""
-    ws = web.WebSocketResponse()
+    # Heartbeat pings let us notice dead peers and reclaim their PTYs
+    ws = web.WebSocketResponse(heartbeat=20, max_msg_size=1 << 20)
     await ws.prepare(request)
     
+    # Disable Nagle so keystroke echoes are never held back, and cork the
+    # socket around each output flush (Linux only) so a frame leaves as one
+    # segment. Sockets behind TLS/proxies may not expose these options.
+    sock = request.transport.get_extra_info('socket') if request.transport else None
+    set_tcp_option(sock, socket.TCP_NODELAY, 1)
+    tcp_cork = getattr(socket, 'TCP_CORK', None)
+    if not set_tcp_option(sock, tcp_cork, 0):
+        tcp_cork = None
+    
     # Check if this is a gpustat request
     is_gpustat = request.query.get('gpustat', '') == '1'
     
@@ -223,20 +472,81 @@ async def terminal_handler(request):
         terminal = WebTerminal()
         terminal.spawn(session_name=session_name)
     
-    # Read loop - send PTY output to WebSocket
-    async def read_loop():
-        while not ws.closed:
-            output = terminal.read()
-            if output:
-                await ws.send_str(output)
-            await asyncio.sleep(0.01)
+    # Let the event loop wake us when the PTY has output, then forward it
+    # to the WebSocket from a single writer task so frames stay in order.
+    # Everything queued since the last send goes out as one frame.
+    loop = asyncio.get_running_loop()
+    out_queue = deque()
+    out_size = 0
+    waker = loop.create_future()
+    eof = False
+    reading = False
+    buffer_full = False  # Our output queue is over OUTPUT_BUFFER_LIMIT
+    client_paused = False  # The browser asked us to hold output
+    
+    def update_reader():
+        nonlocal reading
+        want = not (eof or buffer_full or client_paused)
+        if want and not reading:
+            loop.add_reader(terminal.master_fd, on_readable)
+        elif reading and not want:
+            loop.remove_reader(terminal.master_fd)
+        reading = want
+    
+    def on_readable():
+        nonlocal eof, out_size, buffer_full
+        output = terminal.read()
+        if output is None:
+            # Process exited - stop watching the fd and close the socket
+            eof = True
+            update_reader()
+        elif not output:
+            return
+        else:
+            out_queue.append(output)
+            out_size += len(output)
+            if out_size > OUTPUT_BUFFER_LIMIT:
+                if is_gpustat:
+                    # Stale gpustat frames are worthless; keep the newest
+                    while out_size > OUTPUT_BUFFER_LIMIT and len(out_queue) > 1:
+                        out_size -= len(out_queue.popleft())
+                else:
+                    # Stop reading until the client catches up; the shell
+                    # then blocks on a full PTY instead of us buffering
+                    buffer_full = True
+                    update_reader()
+        if not waker.done():
+            waker.set_result(None)
     
-    read_task = asyncio.create_task(read_loop())
+    async def write_loop():
+        nonlocal waker, out_size, buffer_full
+        while True:
+            await waker
+            waker = loop.create_future()
+            if out_queue:
+                output = b''.join(out_queue)
+                out_queue.clear()
+                out_size = 0
+                set_tcp_option(sock, tcp_cork, 1)
+                try:
+                    await ws.send_bytes(output)
+                finally:
+                    set_tcp_option(sock, tcp_cork, 0)
+                if buffer_full:
+                    buffer_full = False
+                    update_reader()
+            if eof:
+                await ws.close()
+                return
+    
+    TERMINALS[ws] = terminal
+    update_reader()
+    write_task = asyncio.create_task(write_loop())
     
     try:
         async for msg in ws:
             if msg.type == web.WSMsgType.TEXT:
-                data = msg.json() if msg.data.startswith('{') else {'type': 'input', 'data': msg.data}
+                data = json_loads(msg.data) if msg.data.startswith('{') else {'type': 'input', 'data': msg.data}
                 
                 if data.get('type') == 'resize':
                     terminal.resize(data.get('rows', 24), data.get('cols', 80))
@@ -245,41 +555,111 @@ async def terminal_handler(request):
                     terminal.write(data.get('data', ''))
                 elif not is_gpustat:
                     terminal.write(msg.data)
+            elif msg.type == web.WSMsgType.BINARY and msg.data:
+                op = msg.data[0]
+                if op == MSG_INPUT and not is_gpustat:
+                    terminal.write(memoryview(msg.data)[1:])
+                elif op == MSG_RESIZE and len(msg.data) >= 5:
+                    terminal.resize(*struct.unpack_from('>HH', msg.data, 1))
+                elif op in (MSG_PAUSE, MSG_RESUME):
+                    client_paused = op == MSG_PAUSE
+                    update_reader()
     finally:
-        read_task.cancel()
+        TERMINALS.pop(ws, None)
+        loop.remove_reader(terminal.master_fd)
+        write_task.cancel()
         terminal.close()
     
     return ws
 
 
+async def close_terminals_on_shutdown(app):
+    """Close open terminal sockets so their handlers release the PTYs."""
+    for ws in list(TERMINALS):
+        await ws.close(code=WSCloseCode.GOING_AWAY, message=b'Server shutdown')
+
+
 async def kill_session_handler(request):
     """API endpoint to kill a tmux session."""
     session_name = request.query.get('session', '')
     if session_name:
         WebTerminal.kill_session(session_name)
-        return web.json_response({'status': 'ok', 'session': session_name})
-    return web.json_response({'status': 'error', 'message': 'No session specified'}, status=400)
+        return json_response({'status': 'ok', 'session': session_name})
+    return json_response({'status': 'error', 'message': 'No session specified'}, status=400)
 
 
 async def get_state_handler(request):
     """API endpoint to get server-side state."""
-    state = load_server_state()
-    return web.json_response(state)
+    return json_response(_STATE)
 
 
 async def save_state_handler(request):
-    """API endpoint to save server-side state."""
+    """API endpoint to save server-side state.
+    
+    The body may hold only the top-level keys that changed; they are merged
+    into the in-memory state, last writer wins per key.
+    """
     try:
-        state = await request.json()
-        save_server_state(state)
-        return web.json_response({'status': 'ok'})
+        state = json_loads(await request.read())
+        if not isinstance(state, dict):
+            raise ValueError('state must be a JSON object')
+        _STATE.update(state)
+        mark_state_dirty()
+        return json_response({'status': 'ok'})
     except Exception as e:
-        return web.json_response({'status': 'error', 'message': str(e)}, status=400)
+        return json_response({'status': 'error', 'message': str(e)}, status=400)
+
+
+@lru_cache(maxsize=256)
+def list_subdirs(base_dir, mtime_ns):
+    """Sorted (lowercase name, name) pairs for the visible subdirectories of base_dir.
+    
+    Keyed on the directory mtime, so adding or removing entries invalidates it.
+    """
+    found = []
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir():
+                    found.append((entry.name.lower(), entry.name))
+            except OSError:
+                continue
+    found.sort()
+    return tuple(found)
+
+
+def scan_dirs(path, limit=20):
+    """List up to `limit` subdirectories matching `path`, sorted by name.
+    
+    Returns (base_dir, dirs). Listings are cached, so typing more of a name
+    only costs a stat and a bisect over the cached names.
+    """
+    # Determine what to list
+    if os.path.isdir(path):
+        base_dir = path
+        prefix = ''
+    else:
+        base_dir = os.path.dirname(path) or '/'
+        prefix = os.path.basename(path).lower()
+    
+    try:
+        names = list_subdirs(os.path.normpath(base_dir), os.stat(base_dir).st_mtime_ns)
+    except OSError:
+        return base_dir, []
+    
+    dirs = []
+    for i in range(bisect.bisect_left(names, (prefix,)), len(names)):
+        key, name = names[i]
+        if len(dirs) == limit or not key.startswith(prefix):
+            break
+        dirs.append({'name': name, 'path': os.path.join(base_dir, name)})
+    return base_dir, dirs
 
 
 async def list_dirs_handler(request):
     """API endpoint to list directories for autocomplete."""
-    import json
     path = request.query.get('path', '')
     
     # Expand ~ to home directory
@@ -290,64 +670,29 @@ async def list_dirs_handler(request):
     if not path or path == '/':
         dirs = []
         # Add common base directories
-        for base in [os.path.expanduser('~'), '/data']:
+        for base in [HOME_DIR, '/data']:
             if os.path.isdir(base):
                 dirs.append({
                     'name': base,
                     'path': base
                 })
-        return web.json_response({
+        return json_response({
             'base': '/',
             'dirs': dirs
         })
     
-    # Determine what to list
-    if os.path.isdir(path):
-        base_dir = path
-        prefix = ''
-    else:
-        base_dir = os.path.dirname(path) or '/'
-        prefix = os.path.basename(path).lower()
-    
-    # List directories
-    dirs = []
-    try:
-        if os.path.isdir(base_dir):
-            for entry in os.scandir(base_dir):
-                try:
-                    if entry.is_dir() and not entry.name.startswith('.'):
-                        if not prefix or entry.name.lower().startswith(prefix):
-                            full_path = os.path.join(base_dir, entry.name)
-                            dirs.append({
-                                'name': entry.name,
-                                'path': full_path
-                            })
-                except (PermissionError, OSError):
-                    continue
-    except (PermissionError, OSError):
-        pass
-    
-    # Sort and limit
-    dirs.sort(key=lambda x: x['name'].lower())
-    dirs = dirs[:20]  # Limit to 20 suggestions
+    # Scan off the event loop so a slow filesystem can't stall other sockets
+    base_dir, dirs = await asyncio.get_running_loop().run_in_executor(None, scan_dirs, path)
     
-    return web.json_response({
+    return json_response({
         'base': base_dir,
         'dirs': dirs
     })
 
 
-async def index_handler(request):
-    """Serve the terminal web page."""
-    html = '''<!DOCTYPE html>
-<html>
-<head>
-    <title>rdock</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/xterm@5.3.0/css/xterm.min.css">
-    <script src="https://cdn.jsdelivr.net/npm/xterm@5.3.0/lib/xterm.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/xterm-addon-fit@0.8.0/lib/xterm-addon-fit.min.js"></script>
-    <style>
-        * { box-sizing: border-box; }
+# Stylesheet and script of the terminal web page, served from content-hashed
+# URLs so browsers cache them until the code changes
+INDEX_CSS = '''        * { box-sizing: border-box; }
         html, body { margin: 0; padding: 0; background: #1e1e1e; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; height: 100%; overflow: hidden; }
         
         /* Tab bar */
@@ -446,6 +791,9 @@ async def index_handler(request):
             right: 0;
             bottom: 0;
             display: none;
+            /* Sized by its insets, never by its contents, so terminal redraws
+               can be laid out and painted without touching the rest of the page */
+            contain: strict;
         }
         .tab-content.active { display: block; }
         
@@ -646,38 +994,13 @@ async def index_handler(request):
             font-style: italic;
             padding: 8px 0;
         }
-    </style>
-</head>
-<body>
-    <div id="tab-bar">
-        <button id="new-terminal-btn" class="new-tab-btn" title="New Terminal (Ctrl+Shift+T)">▶</button>
-        <div class="btn-separator"></div>
-        <button id="new-vscode-btn" class="new-tab-btn" title="New VS Code (Ctrl+Shift+E)">◇</button>
-        <button id="gpustat-btn" class="new-tab-btn" title="GPU Stats (Ctrl+Shift+G)">🖥️</button>
-    </div>
-    <div id="content-container"></div>
-    
-    <!-- Folder picker modal for VS Code -->
-    <div id="folder-modal">
-        <div class="modal-content">
-            <div class="modal-title">Open Folder in VS Code</div>
-            <div id="recent-workspaces" class="recent-workspaces"></div>
-            <div class="input-wrapper">
-                <input type="text" id="folder-path" class="modal-input" placeholder="Start typing a path... (Tab to complete)" autocomplete="off">
-                <div id="autocomplete-list"></div>
-            </div>
-            <div class="modal-buttons">
-                <button class="modal-btn modal-btn-cancel" id="modal-cancel">Cancel</button>
-                <button class="modal-btn modal-btn-open" id="modal-open">Open</button>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        // Base path for API calls (handles sub-path deployments like /rdock)
+'''
+
+INDEX_JS = '''        // Base path for API calls (handles sub-path deployments like /rdock)
         const basePath = window.location.pathname.replace(/\\/$/, '') || '';
         
         const tabs = new Map(); // tabId -> { type, element, wrapper, ... }
+        const tabOrder = [];    // tabIds in creation order, kept in sync with tabs
         let activeTabId = null;
         let tabCounter = 0;
         let terminalCounter = 0;
@@ -685,12 +1008,118 @@ async def index_handler(request):
         const RECENT_KEY = 'recentWorkspaces';
         const MAX_RECENT = 10;
         
+        // Static containers new tabs are inserted into, looked up once
+        const newTabBtn = document.querySelector('.new-tab-btn');
+        const contentContainer = document.getElementById('content-container');
+        
+        // Binary terminal protocol: first byte is the opcode
+        const MSG_INPUT = 1;   // rest is raw input bytes
+        const MSG_RESIZE = 2;  // rows, cols as big-endian uint16
+        const MSG_PAUSE = 3;   // stop sending output until MSG_RESUME
+        const MSG_RESUME = 4;
+        const textEncoder = new TextEncoder();
+        
+        // Output flow control: pause the server while xterm.js has more than
+        // WRITE_HIGH_WATER bytes queued, resume once it drains below LOW
+        const WRITE_HIGH_WATER = 512 * 1024;
+        const WRITE_LOW_WATER = 64 * 1024;
+        
+        function connectOutput(ws, term) {
+            let pendingBytes = 0;  // Handed to term.write but not yet parsed by xterm.js
+            let paused = false;
+            let queued = [];  // Frames waiting for the next animation frame
+            let scheduled = false;
+            
+            // One term.write per animation frame, however many frames arrived
+            function flush() {
+                scheduled = false;
+                if (!queued.length) return;
+                let data = queued[0];
+                if (queued.length > 1) {
+                    data = new Uint8Array(queued.reduce((n, chunk) => n + chunk.length, 0));
+                    let offset = 0;
+                    for (const chunk of queued) {
+                        data.set(chunk, offset);
+                        offset += chunk.length;
+                    }
+                }
+                queued = [];
+                // Only bytes xterm.js is working through count toward the
+                // watermarks, so frames waiting on rAF can't pause the PTY
+                pendingBytes += data.length;
+                if (!paused && pendingBytes > WRITE_HIGH_WATER && ws.readyState === WebSocket.OPEN) {
+                    paused = true;
+                    ws.send(new Uint8Array([MSG_PAUSE]));
+                }
+                term.write(data, () => {
+                    pendingBytes -= data.length;
+                    if (paused && pendingBytes < WRITE_LOW_WATER && ws.readyState === WebSocket.OPEN) {
+                        paused = false;
+                        ws.send(new Uint8Array([MSG_RESUME]));
+                    }
+                });
+            }
+            
+            ws.binaryType = 'arraybuffer';
+            ws.onmessage = (e) => {
+                // PTY output arrives as raw bytes; xterm.js decodes UTF-8 itself
+                const data = e.data instanceof ArrayBuffer ? new Uint8Array(e.data) : textEncoder.encode(e.data);
+                queued.push(data);
+                if (document.hidden) {
+                    // rAF doesn't run in background tabs; keep draining output
+                    flush();
+                } else if (!scheduled) {
+                    scheduled = true;
+                    requestAnimationFrame(flush);
+                }
+            };
+        }
+        
+        function sendInput(ws, data) {
+            const encoded = textEncoder.encode(data);
+            const buf = new Uint8Array(1 + encoded.length);
+            buf[0] = MSG_INPUT;
+            buf.set(encoded, 1);
+            ws.send(buf);
+        }
+        
+        function sendResize(ws, rows, cols) {
+            ws.send(new Uint8Array([MSG_RESIZE, rows >> 8, rows & 0xff, cols >> 8, cols & 0xff]));
+        }
+        
+        // Tell the server the grid size, only if it differs from what it last heard
+        function syncResize(tabData) {
+            const { ws, term } = tabData;
+            if (ws.readyState !== WebSocket.OPEN) return;
+            if (term.rows === tabData.sentRows && term.cols === tabData.sentCols) return;
+            tabData.sentRows = term.rows;
+            tabData.sentCols = term.cols;
+            sendResize(ws, term.rows, term.cols);
+        }
+        
+        // Coalesce resize notifications to one per animation frame per tab
+        function queueResize(tabData) {
+            if (tabData.resizeQueued) return;
+            tabData.resizeQueued = true;
+            requestAnimationFrame(() => {
+                tabData.resizeQueued = false;
+                syncResize(tabData);
+            });
+        }
+        
         // Server-side state management
+        // Last JSON sent per top-level key, so saves only carry changed keys
+        const savedStateJSON = {};
+        
         async function loadServerState() {
             try {
                 const resp = await fetch(basePath + '/state');
                 if (resp.ok) {
-                    return await resp.json();
+                    const state = await resp.json();
+                    for (const [key, value] of Object.entries(state)) {
+                        savedStateJSON[key] = JSON.stringify(value);
+                    }
+                    return state;
                 }
             } catch (e) {
                 console.error('Failed to load server state:', e);
@@ -715,22 +1144,52 @@ async def index_handler(request):
                 }
             });
             
+            const changes = {};
+            let changed = false;
+            for (const [key, value] of Object.entries(state)) {
+                const json = JSON.stringify(value);
+                if (savedStateJSON[key] !== json) {
+                    changes[key] = value;
+                    savedStateJSON[key] = json;
+                    changed = true;
+                }
+            }
+            if (!changed) return;
+            
             try {
-                await fetch(basePath + '/state', {
+                const resp = await fetch(basePath + '/state', {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(state)
+                    body: JSON.stringify(changes)
                 });
+                if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
             } catch (e) {
                 console.error('Failed to save server state:', e);
+                // Resend these keys with the next save
+                for (const key in changes) delete savedStateJSON[key];
             }
         }
         
-        // Debounced save to avoid too many requests
+        // Throttled save: at most one POST per 250ms, never two in flight.
+        // The payload is built when the timer fires, not on every call.
         let saveTimeout = null;
+        let saveInFlight = false;
+        let restoring = false;  // init() saves once after restoring tabs
         function saveState() {
-            clearTimeout(saveTimeout);
-            saveTimeout = setTimeout(saveServerState, 500);
+            if (restoring || saveTimeout) return;
+            saveTimeout = setTimeout(async () => {
+                saveTimeout = null;
+                if (saveInFlight) {
+                    saveState();
+                    return;
+                }
+                saveInFlight = true;
+                try {
+                    await saveServerState();
+                } finally {
+                    saveInFlight = false;
+                }
+            }, 250);
         }
         
         // Recent workspaces management (now uses server state)
@@ -769,28 +1228,26 @@ async def index_handler(request):
                 return;
             }
             
-            container.innerHTML = `
-                <div class="recent-header">Recent</div>
-                ${recent.map(path => {
-                    const parts = path.split('/').filter(p => p);
-                    const name = parts[parts.length - 1] || path;
-                    return `
-                        <div class="recent-item" data-path="${path}">
-                            <span class="folder-icon">📁</span>
-                            <span class="folder-name">${name}</span>
-                            <span class="folder-fullpath">${path}</span>
-                            <span class="remove-recent" data-path="${path}">×</span>
-                        </div>
-                    `;
-                }).join('')}
-            `;
+            // Paths go in via textContent so names with <, & or " render as-is
+            container.innerHTML = '<div class="recent-header">Recent</div>';
+            recent.forEach(path => {
+                const parts = path.split('/').filter(p => p);
+                const name = parts[parts.length - 1] || path;
+                const item = document.createElement('div');
+                item.className = 'recent-item';
+                item.dataset.path = path;
+                item.innerHTML = '<span class="folder-icon">📁</span><span class="folder-name"></span><span class="folder-fullpath"></span><span class="remove-recent">×</span>';
+                item.querySelector('.folder-name').textContent = name;
+                item.querySelector('.folder-fullpath').textContent = path;
+                container.appendChild(item);
+            });
             
             // Add click handlers
             container.querySelectorAll('.recent-item').forEach(item => {
                 item.onclick = (e) => {
                     if (e.target.classList.contains('remove-recent')) {
                         e.stopPropagation();
-                        removeRecentWorkspace(e.target.dataset.path);
+                        removeRecentWorkspace(item.dataset.path);
                     } else {
                         createVSCodeTab(item.dataset.path);
                         hideFolderModal();
@@ -804,7 +1261,9 @@ async def index_handler(request):
             return `webt_${Date.now()}_${Math.random().toString(36).substr(2, 6)}`;
         }
         
-        function createTerminalTab(sessionName = null, tabTitle = null) {
+        // With `fragments` ({tabs, contents} DocumentFragments), elements are
+        // built detached and the caller inserts and activates them in one go
+        function createTerminalTab(sessionName = null, tabTitle = null, fragments = null) {
             const tabId = `term-${++tabCounter}`;
             terminalCounter++;
             
@@ -815,22 +1274,29 @@ async def index_handler(request):
             // Create tab element
             const tab = document.createElement('div');
             tab.className = 'tab terminal-tab';
-            tab.innerHTML = `<span class="tab-icon">▶</span><span class="tab-title">${title}</span><span class="tab-close">×</span>`;
+            tab.innerHTML = '<span class="tab-icon">▶</span><span class="tab-title"></span><span class="tab-close">×</span>';
+            tab.querySelector('.tab-title').textContent = title;
             tab.dataset.tabId = tabId;
             
-            // Insert before buttons
-            document.querySelector('.new-tab-btn').before(tab);
-            
             // Create terminal wrapper
             const wrapper = document.createElement('div');
             wrapper.className = 'tab-content';
             wrapper.id = `content-${tabId}`;
             wrapper.innerHTML = '<div class="terminal-wrapper"></div>';
-            document.getElementById('content-container').appendChild(wrapper);
             
-            const termContainer = wrapper.querySelector('.terminal-wrapper');
+            if (fragments) {
+                fragments.tabs.appendChild(tab);
+                fragments.contents.appendChild(wrapper);
+            } else {
+                // Insert before buttons
+                newTabBtn.before(tab);
+                contentContainer.appendChild(wrapper);
+            }
+            
+            const termContainer = wrapper.firstChild;
             
-            // Create terminal
+            // Create terminal; it is opened on first activation, once its
+            // container is attached and visible so xterm.js can measure it
             const term = new Terminal({
                 cursorBlink: true,
                 fontSize: 14,
@@ -839,18 +1305,19 @@ async def index_handler(request):
             });
             const fitAddon = new FitAddon.FitAddon();
             term.loadAddon(fitAddon);
-            term.open(termContainer);
             
             // Connect WebSocket with session name for tmux
             const protocol = location.protocol === 'https:' ? 'wss:' : 'ws:';
             const ws = new WebSocket(`${protocol}//${location.host}${basePath}/terminal?session=${encodeURIComponent(session)}`);
+            connectOutput(ws, term);
+            
+            const tabData = { type: 'terminal', term, fitAddon, ws, element: tab, wrapper, termContainer, sessionName: session };
             
             ws.onopen = () => {
                 fitAddon.fit();
-                ws.send(JSON.stringify({type: 'resize', rows: term.rows, cols: term.cols}));
+                queueResize(tabData);
             };
             
-            ws.onmessage = (e) => term.write(e.data);
             ws.onclose = () => {
                 term.write('\\r\\n[Connection closed - reload to reconnect]\\r\\n');
                 tab.style.opacity = '0.5';
@@ -858,23 +1325,22 @@ async def index_handler(request):
             
             term.onData((data) => {
                 if (ws.readyState === WebSocket.OPEN) {
-                    ws.send(JSON.stringify({type: 'input', data: data}));
+                    sendInput(ws, data);
                 }
             });
             
             // Store tab data with session name
-            tabs.set(tabId, { type: 'terminal', term, fitAddon, ws, element: tab, wrapper, sessionName: session });
+            tabs.set(tabId, tabData);
+            tabOrder.push(tabId);
             
-            // Tab click handlers
-            tab.querySelector('.tab-title').onclick = () => activateTab(tabId);
-            tab.querySelector('.tab-close').onclick = (e) => { e.stopPropagation(); closeTab(tabId); };
-            
-            activateTab(tabId);
-            saveState();
+            if (!fragments) {
+                activateTab(tabId);
+                saveState();
+            }
             return tabId;
         }
         
-        function createVSCodeTab(folderPath = '') {
+        function createVSCodeTab(folderPath = '', fragments = null) {
             const tabId = `vscode-${++tabCounter}`;
             vscodeCounter++;
             
@@ -902,28 +1368,34 @@ async def index_handler(request):
             // Create tab element
             const tab = document.createElement('div');
             tab.className = 'tab vscode-tab';
-            tab.innerHTML = `<span class="tab-icon">◇</span><span class="tab-title">${tabTitle}</span><span class="tab-close">×</span>`;
+            tab.innerHTML = '<span class="tab-icon">◇</span><span class="tab-title"></span><span class="tab-close">×</span>';
+            tab.querySelector('.tab-title').textContent = tabTitle;
             tab.dataset.tabId = tabId;
             
-            // Insert before buttons
-            document.querySelector('.new-tab-btn').before(tab);
-            
-            // Create VS Code wrapper with iframe
+            // Create VS Code wrapper with iframe; src is set on first
+            // activation so background tabs don't all load VS Code at once
             const wrapper = document.createElement('div');
             wrapper.className = 'tab-content';
             wrapper.id = `content-${tabId}`;
-            wrapper.innerHTML = `<div class="vscode-wrapper"><iframe src="${vscodeUrl}" allow="clipboard-read; clipboard-write"></iframe></div>`;
-            document.getElementById('content-container').appendChild(wrapper);
+            wrapper.innerHTML = `<div class="vscode-wrapper"><iframe allow="clipboard-read; clipboard-write"></iframe></div>`;
             
-            // Store tab data
-            tabs.set(tabId, { type: 'vscode', element: tab, wrapper, folderPath });
+            if (fragments) {
+                fragments.tabs.appendChild(tab);
+                fragments.contents.appendChild(wrapper);
+            } else {
+                // Insert before buttons
+                newTabBtn.before(tab);
+                contentContainer.appendChild(wrapper);
+            }
             
-            // Tab click handlers
-            tab.querySelector('.tab-title').onclick = () => activateTab(tabId);
-            tab.querySelector('.tab-close').onclick = (e) => { e.stopPropagation(); closeTab(tabId); };
+            // Store tab data
+            tabs.set(tabId, { type: 'vscode', element: tab, wrapper, folderPath, vscodeUrl, loaded: false });
+            tabOrder.push(tabId);
             
-            activateTab(tabId);
-            saveState();
+            if (!fragments) {
+                activateTab(tabId);
+                saveState();
+            }
             return tabId;
         }
         
@@ -937,18 +1409,18 @@ async def index_handler(request):
             tab.dataset.tabId = tabId;
             
             // Insert before buttons
-            document.querySelector('.new-tab-btn').before(tab);
+            newTabBtn.before(tab);
             
             // Create terminal wrapper
             const wrapper = document.createElement('div');
             wrapper.className = 'tab-content';
             wrapper.id = `content-${tabId}`;
             wrapper.innerHTML = '<div class="terminal-wrapper"></div>';
-            document.getElementById('content-container').appendChild(wrapper);
+            contentContainer.appendChild(wrapper);
             
-            const termContainer = wrapper.querySelector('.terminal-wrapper');
+            const termContainer = wrapper.firstChild;
             
-            // Create terminal
+            // Create terminal; the stream starts on first activation
             const term = new Terminal({
                 cursorBlink: false,
                 fontSize: 14,
@@ -958,32 +1430,33 @@ async def index_handler(request):
             });
             const fitAddon = new FitAddon.FitAddon();
             term.loadAddon(fitAddon);
-            term.open(termContainer);
+            
+            // Store tab data
+            tabs.set(tabId, { type: 'gpustat', term, fitAddon, ws: null, element: tab, wrapper, termContainer });
+            tabOrder.push(tabId);
+            
+            activateTab(tabId);
+            return tabId;
+        }
+        
+        function openGPUStatStream(tabData) {
+            const { term, fitAddon } = tabData;
+            term.open(tabData.termContainer);
             
             // Connect WebSocket for gpustat streaming
             const protocol = location.protocol === 'https:' ? 'wss:' : 'ws:';
             const ws = new WebSocket(`${protocol}//${location.host}${basePath}/terminal?gpustat=1`);
+            connectOutput(ws, term);
             
             ws.onopen = () => {
                 fitAddon.fit();
             };
             
-            ws.onmessage = (e) => term.write(e.data);
             ws.onclose = () => {
                 term.write('\\r\\n[GPU Stats stream closed]\\r\\n');
-                tab.style.opacity = '0.5';
+                tabData.element.style.opacity = '0.5';
             };
-            
-            // Store tab data
-            tabs.set(tabId, { type: 'gpustat', term, fitAddon, ws, element: tab, wrapper });
-            
-            // Tab click handlers
-            tab.onclick = () => activateTab(tabId);
-            tab.querySelector('.tab-title').onclick = () => activateTab(tabId);
-            tab.querySelector('.tab-close').onclick = (e) => { e.stopPropagation(); closeTab(tabId); };
-            
-            activateTab(tabId);
-            return tabId;
+            tabData.ws = ws;
         }
         
         function activateTab(tabId) {
@@ -1003,15 +1476,27 @@ async def index_handler(request):
                 current.wrapper.classList.add('active');
                 activeTabId = tabId;
                 
+                // Background tabs load lazily: VS Code on first view, gpustat
+                // streams once they are first shown
+                if (current.type === 'vscode' && !current.loaded) {
+                    current.wrapper.querySelector('iframe').src = current.vscodeUrl;
+                    current.loaded = true;
+                } else if (current.type === 'gpustat' && !current.ws) {
+                    openGPUStatStream(current);
+                }
+                
                 // Focus terminal if it's a terminal tab
                 if (current.type === 'terminal') {
-                    setTimeout(() => {
+                    if (!current.term.element) {
+                        current.term.open(current.termContainer);
+                    }
+                    // Measure once the .active class has been applied, in the
+                    // same frame as the resize message
+                    requestAnimationFrame(() => {
                         current.fitAddon.fit();
                         current.term.focus();
-                        if (current.ws.readyState === WebSocket.OPEN) {
-                            current.ws.send(JSON.stringify({type: 'resize', rows: current.term.rows, cols: current.term.cols}));
-                        }
-                    }, 10);
+                        syncResize(current);
+                    });
                 }
                 
                 saveState();
@@ -1023,8 +1508,8 @@ async def index_handler(request):
             if (!tab) return;
             
             // Cleanup based on type
-            if (tab.type === 'terminal') {
-                if (tab.ws.readyState === WebSocket.OPEN) {
+            if (tab.type === 'terminal' || tab.type === 'gpustat') {
+                if (tab.ws && tab.ws.readyState === WebSocket.OPEN) {
                     tab.ws.close();
                 }
                 tab.term.dispose();
@@ -1039,13 +1524,13 @@ async def index_handler(request):
             tab.element.remove();
             tab.wrapper.remove();
             tabs.delete(tabId);
+            tabOrder.splice(tabOrder.indexOf(tabId), 1);
             
             // Activate another tab if this was active
             if (activeTabId === tabId) {
                 activeTabId = null;
-                const remaining = Array.from(tabs.keys());
-                if (remaining.length > 0) {
-                    activateTab(remaining[remaining.length - 1]);
+                if (tabOrder.length > 0) {
+                    activateTab(tabOrder[tabOrder.length - 1]);
                 }
             }
             
@@ -1057,17 +1542,19 @@ async def index_handler(request):
             saveState();
         }
         
-        // Handle window resize
+        // Handle window resize (debounced; browsers fire many events per drag)
+        let resizeTimeout = null;
         window.addEventListener('resize', () => {
-            if (activeTabId && tabs.has(activeTabId)) {
-                const current = tabs.get(activeTabId);
-                if (current.type === 'terminal') {
-                    current.fitAddon.fit();
-                    if (current.ws.readyState === WebSocket.OPEN) {
-                        current.ws.send(JSON.stringify({type: 'resize', rows: current.term.rows, cols: current.term.cols}));
+            clearTimeout(resizeTimeout);
+            resizeTimeout = setTimeout(() => {
+                if (activeTabId && tabs.has(activeTabId)) {
+                    const current = tabs.get(activeTabId);
+                    if (current.type === 'terminal') {
+                        current.fitAddon.fit();
+                        queueResize(current);
                     }
                 }
-            }
+            }, 120);
         });
         
         // Folder modal handling with autocomplete
@@ -1075,6 +1562,7 @@ async def index_handler(request):
         const folderInput = document.getElementById('folder-path');
         const autocompleteList = document.getElementById('autocomplete-list');
         let autocompleteItems = [];
+        const autocompletePool = [];  // Reused .autocomplete-item rows
         let selectedIndex = -1;
         let fetchTimeout = null;
         
@@ -1096,7 +1584,6 @@ async def index_handler(request):
         
         function hideAutocomplete() {
             autocompleteList.classList.remove('show');
-            autocompleteList.innerHTML = '';
             autocompleteItems = [];
             selectedIndex = -1;
         }
@@ -1119,21 +1606,37 @@ async def index_handler(request):
             
             autocompleteItems = dirs;
             selectedIndex = -1;
-            autocompleteList.innerHTML = dirs.map((d, i) => `
-                <div class="autocomplete-item" data-index="${i}" data-path="${d.path}">
-                    <span class="folder-icon">📁</span>
-                    <span class="folder-name">${d.name}</span>
-                    <span class="folder-path">${basePath}</span>
-                </div>
-            `).join('');
-            autocompleteList.classList.add('show');
-            
-            // Add click handlers
-            autocompleteList.querySelectorAll('.autocomplete-item').forEach(item => {
-                item.onclick = () => selectItem(parseInt(item.dataset.index));
+            // Reuse pooled rows, only updating their text
+            dirs.forEach((d, i) => {
+                const item = getAutocompleteItem(i);
+                item.querySelector('.folder-name').textContent = d.name;
+                item.querySelector('.folder-path').textContent = basePath;
+                item.classList.remove('selected');
+                item.style.display = '';
             });
+            for (let i = dirs.length; i < autocompletePool.length; i++) {
+                autocompletePool[i].style.display = 'none';
+            }
+            autocompleteList.classList.add('show');
+        }
+        
+        function getAutocompleteItem(index) {
+            if (index < autocompletePool.length) return autocompletePool[index];
+            const item = document.createElement('div');
+            item.className = 'autocomplete-item';
+            item.dataset.index = index;
+            item.innerHTML = '<span class="folder-icon">📁</span><span class="folder-name"></span><span class="folder-path"></span>';
+            autocompleteList.appendChild(item);
+            autocompletePool.push(item);
+            return item;
         }
         
+        // One delegated handler for every (pooled) suggestion row
+        autocompleteList.addEventListener('click', (e) => {
+            const item = e.target.closest('.autocomplete-item');
+            if (item) selectItem(parseInt(item.dataset.index));
+        });
+        
         function selectItem(index) {
             if (index >= 0 && index < autocompleteItems.length) {
                 folderInput.value = autocompleteItems[index].path + '/';
@@ -1144,13 +1647,14 @@ async def index_handler(request):
         }
         
         function updateSelection(newIndex) {
-            const items = autocompleteList.querySelectorAll('.autocomplete-item');
-            items.forEach(item => item.classList.remove('selected'));
+            if (selectedIndex >= 0) {
+                autocompletePool[selectedIndex].classList.remove('selected');
+            }
             
-            if (newIndex >= 0 && newIndex < items.length) {
+            if (newIndex >= 0 && newIndex < autocompleteItems.length) {
                 selectedIndex = newIndex;
-                items[selectedIndex].classList.add('selected');
-                items[selectedIndex].scrollIntoView({ block: 'nearest' });
+                autocompletePool[selectedIndex].classList.add('selected');
+                autocompletePool[selectedIndex].scrollIntoView({ block: 'nearest' });
             } else {
                 selectedIndex = -1;
             }
@@ -1208,67 +1712,59 @@ async def index_handler(request):
             if (e.target === folderModal) hideFolderModal();
         };
         
-        // Keyboard shortcuts
-        document.addEventListener('keydown', (e) => {
-            // Detect Cmd (Mac) or Ctrl (Win/Linux)
-            const isMac = navigator.platform.toUpperCase().indexOf('MAC') >= 0;
-            const modKey = isMac ? e.metaKey : e.ctrlKey;
-            
-            // Cmd/Ctrl+W: Close current tab (override browser close)
-            if (modKey && !e.shiftKey && e.key.toLowerCase() === 'w') {
-                e.preventDefault();
-                e.stopPropagation();
-                if (activeTabId) closeTab(activeTabId);
-                return false;
+        // Keyboard shortcuts, keyed by "[meta+][ctrl+][alt+][shift+]key".
+        // MOD is Cmd on Mac and Ctrl elsewhere.
+        const isMac = navigator.platform.toUpperCase().indexOf('MAC') >= 0;
+        const MOD = isMac ? 'meta' : 'ctrl';
+        
+        function cycleTab(step) {
+            const idx = tabOrder.indexOf(activeTabId);
+            if (idx >= 0 && tabOrder.length > 1) {
+                activateTab(tabOrder[(idx + step + tabOrder.length) % tabOrder.length]);
             }
-            // Cmd/Ctrl+Shift+W: Also close current tab
-            if (modKey && e.shiftKey && e.key.toLowerCase() === 'w') {
+        }
+        
+        const closeActiveTab = () => { if (activeTabId) closeTab(activeTabId); };
+        const shortcuts = new Map([
+            // Close current tab (overrides browser close)
+            [`${MOD}+w`, closeActiveTab],
+            [`${MOD}+shift+w`, closeActiveTab],
+            // New terminal (Cmd/Ctrl+T overrides browser new tab)
+            ['ctrl+shift+t', () => createTerminalTab()],
+            [`${MOD}+t`, () => createTerminalTab()],
+            // New VS Code, GPU stats
+            ['ctrl+shift+e', showFolderModal],
+            ['ctrl+shift+g', () => createGPUStatTab()],
+            // Next / previous tab
+            ['ctrl+tab', () => cycleTab(1)],
+            ['ctrl+shift+tab', () => cycleTab(-1)],
+        ]);
+        
+        document.addEventListener('keydown', (e) => {
+            // Every shortcut needs Ctrl or Cmd; plain typing exits here
+            if (!e.ctrlKey && !e.metaKey) return;
+            const sig = (e.metaKey ? 'meta+' : '') + (e.ctrlKey ? 'ctrl+' : '') +
+                (e.altKey ? 'alt+' : '') + (e.shiftKey ? 'shift+' : '') + e.key.toLowerCase();
+            const fn = shortcuts.get(sig);
+            if (fn) {
                 e.preventDefault();
                 e.stopPropagation();
-                if (activeTabId) closeTab(activeTabId);
+                fn();
                 return false;
             }
-            // Ctrl+Shift+T: New terminal
-            if (e.ctrlKey && e.shiftKey && e.key === 'T') {
-                e.preventDefault();
-                createTerminalTab();
-            }
-            // Ctrl+Shift+E: New VS Code
-            if (e.ctrlKey && e.shiftKey && e.key === 'E') {
-                e.preventDefault();
-                showFolderModal();
-            }
-            // Ctrl+Shift+G: GPU Stats
-            if (e.ctrlKey && e.shiftKey && e.key === 'G') {
-                e.preventDefault();
-                createGPUStatTab();
-            }
-            // Cmd/Ctrl+T: New terminal (override browser new tab)
-            if (modKey && !e.shiftKey && e.key.toLowerCase() === 't') {
-                e.preventDefault();
+        }, true); // Use capture phase to intercept before browser
+        
+        // Tab clicks are handled once on the tab bar instead of per tab
+        document.getElementById('tab-bar').addEventListener('click', (e) => {
+            const tab = e.target.closest('.tab');
+            if (!tab) return;
+            if (e.target.classList.contains('tab-close')) {
                 e.stopPropagation();
-                createTerminalTab();
-                return false;
-            }
-            // Ctrl+Tab: Next tab
-            if (e.ctrlKey && e.key === 'Tab' && !e.shiftKey) {
-                e.preventDefault();
-                const ids = Array.from(tabs.keys());
-                const idx = ids.indexOf(activeTabId);
-                if (idx >= 0 && ids.length > 1) {
-                    activateTab(ids[(idx + 1) % ids.length]);
-                }
-            }
-            // Ctrl+Shift+Tab: Previous tab
-            if (e.ctrlKey && e.shiftKey && e.key === 'Tab') {
-                e.preventDefault();
-                const ids = Array.from(tabs.keys());
-                const idx = ids.indexOf(activeTabId);
-                if (idx >= 0 && ids.length > 1) {
-                    activateTab(ids[(idx - 1 + ids.length) % ids.length]);
-                }
+                closeTab(tab.dataset.tabId);
+            } else {
+                activateTab(tab.dataset.tabId);
             }
-        }, true); // Use capture phase to intercept before browser
+        });
         
         // Button handlers
         document.getElementById('new-terminal-btn').onclick = () => createTerminalTab();
@@ -1279,6 +1775,8 @@ async def index_handler(request):
         async function init() {
             const state = await loadServerState();
             if (state && state.tabs && state.tabs.length > 0) {
+                restoring = true;
+                
                 // Restore counters
                 tabCounter = state.tabCounter || 0;
                 terminalCounter = 0; // Will be incremented as tabs are created
@@ -1287,19 +1785,33 @@ async def index_handler(request):
                 // Restore recent workspaces
                 cachedRecentWorkspaces = state.recentWorkspaces || [];
                 
-                // Restore tabs
+                // Restore tabs, building them detached and inserting once
+                const fragments = {
+                    tabs: document.createDocumentFragment(),
+                    contents: document.createDocumentFragment()
+                };
+                let lastTabId = null;
                 state.tabs.forEach(tabData => {
                     if (tabData.type === 'terminal') {
-                        createTerminalTab(tabData.sessionName);
+                        lastTabId = createTerminalTab(tabData.sessionName, null, fragments);
                     } else if (tabData.type === 'vscode') {
-                        createVSCodeTab(tabData.folderPath);
+                        lastTabId = createVSCodeTab(tabData.folderPath, fragments);
                     }
                 });
+                newTabBtn.before(fragments.tabs);
+                contentContainer.appendChild(fragments.contents);
                 
                 // Restore active tab
                 if (state.activeTabId && tabs.has(state.activeTabId)) {
                     activateTab(state.activeTabId);
+                } else if (lastTabId) {
+                    activateTab(lastTabId);
+                } else {
+                    createTerminalTab();
                 }
+                
+                restoring = false;
+                saveState();
             } else {
                 // No saved state, create first terminal
                 createTerminalTab();
@@ -1307,26 +1819,122 @@ async def index_handler(request):
         }
         
         init();
-    </script>
-</body>
-</html>'''
-    return web.Response(text=html, content_type='text/html')
+'''
 
+STATIC_ASSETS = {}  # hashed filename -> (body, gzipped body, content type)
 
-async def login_page_handler(request):
-    """Serve the login page."""
-    server_info = get_server_info()
-    base_path = BASE_PATH  # For use in template
-    error_msg = request.query.get('error', '')
+
+def add_static_asset(stem, ext, text, content_type):
+    """Register an in-memory asset under a content-hashed name and return its URL."""
+    body = text.encode('utf-8')
+    name = f"{stem}.{hashlib.blake2b(body, digest_size=8).hexdigest()}.{ext}"
+    STATIC_ASSETS[name] = (body, gzip.compress(body, 9), content_type)
+    return f'{BASE_PATH}/static/{name}'
+
+
+# The terminal web page is static, so it is encoded and compressed once
+INDEX_HTML = '''<!DOCTYPE html>
+<html>
+<head>
+    <title>rdock</title>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/xterm@5.3.0/css/xterm.min.css">
+    <script src="https://cdn.jsdelivr.net/npm/xterm@5.3.0/lib/xterm.min.js"></script>
+    <script src="https://cdn.jsdelivr.net/npm/xterm-addon-fit@0.8.0/lib/xterm-addon-fit.min.js"></script>
+    <link rel="stylesheet" href="{css_url}">
+</head>
+<body>
+    <div id="tab-bar">
+        <button id="new-terminal-btn" class="new-tab-btn" title="New Terminal (Ctrl+Shift+T)">▶</button>
+        <div class="btn-separator"></div>
+        <button id="new-vscode-btn" class="new-tab-btn" title="New VS Code (Ctrl+Shift+E)">◇</button>
+        <button id="gpustat-btn" class="new-tab-btn" title="GPU Stats (Ctrl+Shift+G)">🖥️</button>
+    </div>
+    <div id="content-container"></div>
     
-    error_html = ''
-    if error_msg:
-        error_html = f'<div class="error-msg">{error_msg}</div>'
+    <!-- Folder picker modal for VS Code -->
+    <div id="folder-modal">
+        <div class="modal-content">
+            <div class="modal-title">Open Folder in VS Code</div>
+            <div id="recent-workspaces" class="recent-workspaces"></div>
+            <div class="input-wrapper">
+                <input type="text" id="folder-path" class="modal-input" placeholder="Start typing a path... (Tab to complete)" autocomplete="off">
+                <div id="autocomplete-list"></div>
+            </div>
+            <div class="modal-buttons">
+                <button class="modal-btn modal-btn-cancel" id="modal-cancel">Cancel</button>
+                <button class="modal-btn modal-btn-open" id="modal-open">Open</button>
+            </div>
+        </div>
+    </div>
     
-    html = f'''<!DOCTYPE html>
+    <script src="{js_url}"></script>
+</body>
+</html>'''.format(
+    css_url=add_static_asset('app', 'css', INDEX_CSS, 'text/css'),
+    js_url=add_static_asset('app', 'js', INDEX_JS, 'application/javascript'),
+).encode('utf-8')
+INDEX_HTML_GZ = gzip.compress(INDEX_HTML, 9)
+INDEX_ETAG = '"' + hashlib.md5(INDEX_HTML, usedforsecurity=False).hexdigest() + '"'
+INDEX_ETAG_GZ = INDEX_ETAG[:-1] + '-gzip"'  # Strong validators differ per content-coding
+
+
+def accepts_gzip(request):
+    """Whether Accept-Encoding allows a gzip body; an explicit q=0 refuses it."""
+    wildcard = False
+    for coding in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = coding.partition(';')
+        name = name.strip().lower()
+        if name not in ('gzip', '*'):
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name == 'gzip':
+            return q > 0
+        wildcard = q > 0
+    return wildcard
+
+
+async def index_handler(request):
+    """Serve the terminal web page."""
+    headers = {'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+    if_none_match = request.headers.get('If-None-Match', '')
+    for etag in (INDEX_ETAG_GZ, INDEX_ETAG):
+        if etag in if_none_match:
+            headers['ETag'] = etag
+            return web.Response(status=304, headers=headers)
+    if accepts_gzip(request):
+        headers['ETag'] = INDEX_ETAG_GZ
+        headers['Content-Encoding'] = 'gzip'
+        return web.Response(body=INDEX_HTML_GZ, content_type='text/html', charset='utf-8', headers=headers)
+    headers['ETag'] = INDEX_ETAG
+    return web.Response(body=INDEX_HTML, content_type='text/html', charset='utf-8', headers=headers)
+
+
+async def static_handler(request):
+    """Serve a content-hashed page asset; its URL changes with its content."""
+    asset = STATIC_ASSETS.get(request.match_info['name'])
+    if asset is None:
+        raise web.HTTPNotFound()
+    body, body_gz, content_type = asset
+    headers = {'Cache-Control': 'public, max-age=31536000, immutable', 'Vary': 'Accept-Encoding'}
+    if accepts_gzip(request):
+        headers['Content-Encoding'] = 'gzip'
+        body = body_gz
+    return web.Response(body=body, content_type=content_type, charset='utf-8', headers=headers)
+
+
+# Login page; the doubled braces are CSS, the single ones are filled in once
+# by login_page_parts()
+LOGIN_HTML_TEMPLATE = '''<!DOCTYPE html>
 <html>
 <head>
-    <title>Login - {server_info['hostname']}</title>
+    <title>Login - {hostname}</title>
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <style>
         * {{ box-sizing: border-box; margin: 0; padding: 0; }}
@@ -1468,8 +2076,8 @@ async def login_page_handler(request):
         <div class="login-card">
             <div class="server-info">
                 <div class="server-icon">⬢</div>
-                <div class="server-name">{server_info['hostname']}</div>
-                <div class="server-user">{server_info['user']}</div>
+                <div class="server-name">{hostname}</div>
+                <div class="server-user">{user}</div>
             </div>
             
             {error_html}
@@ -1494,7 +2102,29 @@ async def login_page_handler(request):
     </div>
 </body>
 </html>'''
-    return web.Response(text=html, content_type='text/html')
+
+
+@lru_cache(maxsize=None)
+def login_page_parts():
+    """Return the login page encoded around its error slot, plus the no-error page."""
+    server_info = get_server_info()
+    page = LOGIN_HTML_TEMPLATE.format(
+        hostname=html.escape(server_info['hostname']),
+        user=html.escape(server_info['user']),
+        base_path=BASE_PATH,
+        error_html='\0',
+    )
+    head, tail = (part.encode('utf-8') for part in page.split('\0'))
+    return head, tail, head + tail
+
+
+async def login_page_handler(request):
+    """Serve the login page."""
+    head, tail, page = login_page_parts()
+    error_msg = request.query.get('error', '')
+    if error_msg:
+        page = b''.join((head, b'<div class="error-msg">', html.escape(error_msg).encode('utf-8'), b'</div>', tail))
+    return web.Response(body=page, content_type='text/html', charset='utf-8')
 
 
 async def login_handler(request):
@@ -1506,17 +2136,18 @@ async def login_handler(request):
     if not htpasswd_exists():
         session_id = create_session('anonymous')
         response = web.HTTPFound(home_url)
-        response.set_cookie('session_id', session_id, max_age=86400*30, httponly=True)
+        response.set_cookie('session_id', session_id, max_age=SESSION_TTL, httponly=True)
         return response
     
     data = await request.post()
     username = data.get('username', '')
     password = data.get('password', '')
     
-    if verify_htpasswd(username, password):
+    # bcrypt (or the htpasswd fallback) takes long enough to stall other clients
+    if await asyncio.get_running_loop().run_in_executor(None, verify_htpasswd, username, password):
         session_id = create_session(username)
         response = web.HTTPFound(home_url)
-        response.set_cookie('session_id', session_id, max_age=86400*30, httponly=True)  # 30 days
+        response.set_cookie('session_id', session_id, max_age=SESSION_TTL, httponly=True)
         return response
     else:
         return web.HTTPFound(f'{login_url}?error=Invalid%20username%20or%20password')
@@ -1526,41 +2157,44 @@ async def logout_handler(request):
     """Handle logout."""
     login_url = f'{BASE_PATH}/login' if BASE_PATH else '/login'
     session_id = request.cookies.get('session_id')
-    if session_id and session_id in SESSIONS:
-        del SESSIONS[session_id]
+    if session_id:
+        SESSIONS.pop(session_id, None)
     response = web.HTTPFound(login_url)
     response.del_cookie('session_id')
     return response
 
 
-async def auth_middleware(app, handler):
+# Endpoints that get a 401 instead of a login redirect
+_API_PATHS = frozenset({'/terminal', '/state', '/list-dirs', '/kill-session'})
+
+
+@web.middleware
+async def auth_middleware(request, handler):
     """Middleware to check authentication."""
-    async def middleware_handler(request):
-        # Login page is always accessible
-        if request.path == '/login':
-            return await handler(request)
-        
-        # If no htpasswd file, allow access (fall back to nginx auth if configured)
-        if not htpasswd_exists():
-            return await handler(request)
-        
-        # Check session
-        if not verify_session(request):
-            # For API/WebSocket, return 401
-            if request.path in ['/terminal', '/state', '/list-dirs', '/kill-session']:
-                return web.json_response({'error': 'Unauthorized'}, status=401)
-            # Redirect to login with base path
-            login_url = f'{BASE_PATH}/login' if BASE_PATH else '/login'
-            return web.HTTPFound(login_url)
-        
+    # Login page is always accessible
+    if request.path == '/login':
         return await handler(request)
     
-    return middleware_handler
+    # If no htpasswd file, allow access (fall back to nginx auth if configured)
+    if not htpasswd_exists():
+        return await handler(request)
+    
+    # Check session
+    if not verify_session(request):
+        # For API/WebSocket, return 401
+        if request.path in _API_PATHS:
+            return json_response({'error': 'Unauthorized'}, status=401)
+        # Redirect to login with base path
+        login_url = f'{BASE_PATH}/login' if BASE_PATH else '/login'
+        return web.HTTPFound(login_url)
+    
+    return await handler(request)
 
 
 # Create app
 app = web.Application(middlewares=[auth_middleware])
 app.router.add_get('/', index_handler)
+app.router.add_get('/static/{name}', static_handler)
 app.router.add_get('/login', login_page_handler)
 app.router.add_post('/login', login_handler)
 app.router.add_get('/logout', logout_handler)
@@ -1569,7 +2203,11 @@ app.router.add_get('/list-dirs', list_dirs_handler)
 app.router.add_get('/kill-session', kill_session_handler)
 app.router.add_get('/state', get_state_handler)
 app.router.add_post('/state', save_state_handler)
+app.on_shutdown.append(close_terminals_on_shutdown)
+app.on_cleanup.append(flush_state_on_cleanup)
 
 if __name__ == '__main__':
     port = int(os.environ.get('RDOCK_PORT', 8890))
-    web.run_app(app, host='0.0.0.0', port=port)
+    print(f"Event loop: {install_event_loop_policy()}")
+    # nginx already keeps an access log; don't format a second line per request
+    web.run_app(app, host='0.0.0.0', port=port, access_log=None)